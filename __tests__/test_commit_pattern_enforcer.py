@@ -1,111 +1,152 @@
 import os
 import sys
 import json
-import tempfile
+import random
 import pytest
+from types import SimpleNamespace
+from scripts import main as main_module
 from scripts.main import CommitValidator, GitHubAction
 
-class DummyGitHubAction(GitHubAction):
-    outputs = {}
-    failed = False
-    messages = []
+CONVENTIONAL_PATTERN = r'^(feat|fix|docs|style|refactor|test|chore|build|ci|perf|revert)(\(.+\))?: .+'
 
-    @staticmethod
-    def set_output(name, value):
-        DummyGitHubAction.outputs[name] = value
+BASE_ENV = {
+    'GITHUB_EVENT_NAME': 'push',
+    'INPUT_PATTERN': CONVENTIONAL_PATTERN,
+    'INPUT_CHECK_ALL_COMMITS': 'false',
+    'INPUT_CASE_SENSITIVE': 'true',
+}
+
+@pytest.fixture(scope="session")
+def conventional_pattern():
+    assert main_module._DEFAULT_PATTERN_SRC == CONVENTIONAL_PATTERN
+    return main_module._DEFAULT_PATTERN_CS
+
+@pytest.fixture
+def gh(monkeypatch):
+    ns = SimpleNamespace(outputs={}, messages=[], failed=False)
+    ns.get_input = GitHubAction.get_input
+    ns.set_output = ns.outputs.__setitem__
+    ns.info = ns.error = ns.warning = ns.messages.append
 
-    @staticmethod
     def set_failed(message):
-        DummyGitHubAction.failed = True
-        DummyGitHubAction.messages.append(message)
         # Do not exit in tests
+        ns.messages.append(message)
+        ns.failed = True
+
+    ns.set_failed = set_failed
+    monkeypatch.setattr('scripts.main.GitHubAction', ns)
+    return ns
+
+@pytest.fixture(scope="session")
+def events_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("events")
+
+def write_event(events_dir, name: str, event: dict) -> str:
+    path = events_dir / f"{name}.json"
+    path.write_bytes(json.dumps(event, separators=(',', ':')).encode())
+    return str(path)
+
+@pytest.fixture
+def use_event(monkeypatch):
+    def _use(event: dict):
+        monkeypatch.setattr(main_module, '_event_reader', lambda: event)
+    return _use
 
-    @staticmethod
-    def info(message):
-        DummyGitHubAction.messages.append(message)
-
-    @staticmethod
-    def error(message):
-        DummyGitHubAction.messages.append(message)
-
-    @staticmethod
-    def warning(message):
-        DummyGitHubAction.messages.append(message)
-
-@pytest.fixture(autouse=True)
-def patch_github_action(monkeypatch):
-    monkeypatch.setattr('scripts.main.GitHubAction', DummyGitHubAction)
-    DummyGitHubAction.outputs = {}
-    DummyGitHubAction.failed = False
-    DummyGitHubAction.messages = []
-
-def make_event_file(event: dict):
-    fd, path = tempfile.mkstemp()
-    with os.fdopen(fd, 'w') as f:
-        json.dump(event, f)
-    return path
-
-def test_valid_commit(monkeypatch):
-    event = {"commits": [{"message": "feat: add new feature", "id": "abc123"}]}
-    path = make_event_file(event)
-    monkeypatch.setenv('GITHUB_EVENT_NAME', 'push')
-    monkeypatch.setenv('GITHUB_EVENT_PATH', path)
-    monkeypatch.setenv('INPUT_PATTERN', r'^(feat|fix|docs|style|refactor|test|chore|build|ci|perf|revert)(\(.+\))?: .+')
-    monkeypatch.setenv('INPUT_CHECK_ALL_COMMITS', 'false')
+@pytest.fixture
+def default_env(monkeypatch):
+    for name, value in BASE_ENV.items():
+        monkeypatch.setenv(name, value)
+    return monkeypatch
+
+@pytest.fixture(scope="session")
+def validator_cache():
+    return {}
+
+@pytest.fixture
+def make_validator(default_env, validator_cache):
+    def _make(**inputs):
+        for name, value in inputs.items():
+            default_env.setenv(f"INPUT_{name.upper()}", value)
+        # Validators only read INPUT_* at construction, so those values identify one
+        key = tuple(sorted((k, v) for k, v in os.environ.items() if k.startswith('INPUT_')))
+        validator = validator_cache.get(key)
+        if validator is None:
+            validator = validator_cache[key] = CommitValidator()
+        return validator
+    return _make
+
+def test_shared_pattern_cache(default_env, conventional_pattern):
     validator = CommitValidator()
-    is_valid, failed = validator.validate_commits(validator.get_commits())
-    assert is_valid
-    assert failed == []
-
-def test_invalid_commit(monkeypatch):
-    event = {"commits": [{"message": "bad commit", "id": "def456"}]}
-    path = make_event_file(event)
-    monkeypatch.setenv('GITHUB_EVENT_NAME', 'push')
-    monkeypatch.setenv('GITHUB_EVENT_PATH', path)
-    monkeypatch.setenv('INPUT_PATTERN', r'^(feat|fix|docs|style|refactor|test|chore|build|ci|perf|revert)(\(.+\))?: .+')
-    monkeypatch.setenv('INPUT_CHECK_ALL_COMMITS', 'false')
+    assert validator.regex is conventional_pattern
+    default_env.setenv('INPUT_CASE_SENSITIVE', 'false')
     validator = CommitValidator()
+    assert validator.regex is main_module._DEFAULT_PATTERN_CI
+    assert validator._matches == main_module._DEFAULT_PATTERN_CI.search
+
+@pytest.mark.parametrize("message", [
+    "feat: add", "fix(api): handle nulls", "feat: ", "feat:", "feat:x", "feat : x",
+    "feat: : ", "feature: x", "Feat: x", "feat(): x", "feat()): x", "feat(a): ",
+    "feat(a: b): c", "feat(a): ): x", "feat(a) : x", "feat(: x", "revert(x)(y): z",
+    "ci: x\nmore", "ci: \nmore", "chore(x\n): y", "docs: add (notes)", "",
+])
+def test_fast_path_matches_default_pattern(make_validator, conventional_pattern, message):
+    validator = make_validator()
+    assert validator._matches is main_module._match_conventional
+    assert validator._matches(message) == bool(conventional_pattern.search(message))
+
+def test_fast_path_fuzz(conventional_pattern):
+    rng = random.Random(1234)
+    pieces = ['feat', 'fix', 'ci', 'revert', '(', ')', ':', ' ', ': ', '): ', '\n', 'a', 'x']
+    for _ in range(20000):
+        message = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 8)))
+        assert main_module._match_conventional(message) == bool(conventional_pattern.search(message)), message
+
+def test_custom_pattern_compiled_once(default_env):
+    default_env.setenv('INPUT_PATTERN', r'^JIRA-\d+: .+')
+    assert CommitValidator().regex is CommitValidator().regex
+
+VALIDATE_CASES = [
+    # commits, check_all, case_sensitive, expected_valid, expected_failed_ids
+    ([("feat: add new feature", "abc123")], "false", "true", True, []),
+    ([("bad commit", "def456")], "false", "true", False, ["def456"]),
+    ([("FEAT: ADD", "abc123")], "false", "false", True, []),
+    ([("FEAT: ADD", "abc123")], "false", "true", False, ["abc123"]),
+    ([("fix(api): handle nulls\n\nLonger body", "a1")], "false", "true", True, []),
+    ([("feat: add", "a1"), ("fix: bug", "b2"), ("bad msg", "c3")], "true", "true", False, ["c3"]),
+    ([("bad msg", "a1"), ("feat: add", "b2")], "false", "true", True, []),
+    ([("bad msg", "a1"), ("also bad", "b2")], "true", "true", False, ["a1", "b2"]),
+    ([("Docs: readme", "a1"), ("CHORE(deps): bump", "b2")], "true", "false", True, []),
+    ([], "true", "true", True, []),
+]
+
+@pytest.mark.parametrize("commits,check_all,case_sensitive,expected_valid,expected_failed", VALIDATE_CASES)
+def test_validate(gh, make_validator, use_event, commits, check_all, case_sensitive, expected_valid, expected_failed):
+    use_event({"commits": [{"message": message, "id": commit_id} for message, commit_id in commits]})
+    validator = make_validator(check_all_commits=check_all, case_sensitive=case_sensitive)
     is_valid, failed = validator.validate_commits(validator.get_commits())
-    assert not is_valid
-    assert len(failed) == 1
-    assert failed[0]['id'] == 'def456'
+    assert is_valid == expected_valid
+    assert [c['id'] for c in failed] == expected_failed
 
-def test_multiple_commits_check_all(monkeypatch):
+def test_missing_event_payload(gh, default_env, make_validator):
+    default_env.delenv('GITHUB_EVENT_PATH', raising=False)
+    assert make_validator().get_commits() == []
+    assert gh.messages[-1] == "No event payload found"
+
+def test_malformed_event_payload(gh, default_env, make_validator, events_dir):
+    path = events_dir / 'malformed.json'
+    path.write_bytes(b'{"commits": [')
+    default_env.setenv('GITHUB_EVENT_PATH', str(path))
+    assert make_validator().get_commits() == []
+    assert gh.messages[-1].startswith("Could not read event payload")
+
+def test_run_sets_outputs(gh, default_env, make_validator, events_dir):
     event = {"commits": [
-        {"message": "feat: add", "id": "a1"},
-        {"message": "fix: bug", "id": "b2"},
-        {"message": "bad msg", "id": "c3"}
+        {"message": "bad msg", "id": "a1"},
+        {"message": "feat: add", "id": "b2"}
     ]}
-    path = make_event_file(event)
-    monkeypatch.setenv('GITHUB_EVENT_NAME', ' ')
-    monkeypatch.setenv('GITHUB_EVENT_NAME', 'push')
-    monkeypatch.setenv('GITHUB_EVENT_PATH', path)
-    monkeypatch.setenv('INPUT_PATTERN', r'^(feat|fix|docs|style|refactor|test|chore|build|ci|perf|revert)(\(.+\))?: .+')
-    monkeypatch.setenv('INPUT_CHECK_ALL_COMMITS', 'true')
-    validator = CommitValidator()
-    is_valid, failed = validator.validate_commits(validator.get_commits())
-    assert not is_valid
-    assert len(failed) == 1
-    assert failed[0]['id'] == 'c3'
-
-def test_no_commits(monkeypatch):
-    event = {"commits": []}
-    path = make_event_file(event)
-    monkeypatch.setenv('GITHUB_EVENT_NAME', 'push')
-    monkeypatch.setenv('GITHUB_EVENT_PATH', path)
-    validator = CommitValidator()
-    is_valid, failed = validator.validate_commits(validator.get_commits())
-    assert is_valid
-    assert failed == []
-
-def test_case_insensitive(monkeypatch):
-    event = {"commits": [{"message": "FEAT: ADD", "id": "abc123"}]}
-    path = make_event_file(event)
-    monkeypatch.setenv('GITHUB_EVENT_NAME', 'push')
-    monkeypatch.setenv('GITHUB_EVENT_PATH', path)
-    monkeypatch.setenv('INPUT_PATTERN', r'^(feat|fix|docs|style|refactor|test|chore|build|ci|perf|revert)(\(.+\))?: .+')
-    monkeypatch.setenv('INPUT_CASE_SENSITIVE', 'false')
-    validator = CommitValidator()
-    is_valid, failed = validator.validate_commits(validator.get_commits())
-    assert is_valid
-    assert failed == []
+    default_env.setenv('GITHUB_EVENT_PATH', write_event(events_dir, 'run', event))
+    make_validator().run()
+    assert gh.outputs['valid'] == 'true'
+    assert gh.outputs['failed-commits'] == '[]'
+    assert gh.outputs['total-commits'] == 2
+    assert not gh.failed
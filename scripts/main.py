@@ -5,12 +5,65 @@ Commit Pattern Enforcer - A GitHub Action to validate commit messages against re
 
 import os
 import re
+import functools
 import json
 import sys
-import requests
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 
 
+_DEFAULT_PATTERN_SRC = r'^(feat|fix|docs|style|refactor|test|chore|build|ci|perf|revert)(\(.+\))?: .+'
+
+_TYPES = frozenset({'feat', 'fix', 'docs', 'style', 'refactor', 'test', 'chore', 'build', 'ci', 'perf', 'revert'})
+
+# 'type: ' prefixes, accepted when followed by at least one more character
+_VALID_PREFIXES_COLON = tuple(f'{t}: ' for t in sorted(_TYPES))
+_BARE_PREFIXES = frozenset(_VALID_PREFIXES_COLON)
+
+
+@functools.lru_cache(maxsize=32)
+def _compile(src: str, ignore_case: bool) -> 're.Pattern':
+    """Compile a pattern once per (source, case mode) and share it across validators"""
+    return re.compile(src, re.IGNORECASE if ignore_case else 0)
+
+
+# Both case modes of the default pattern are compiled at import time
+_DEFAULT_PATTERN_CS = _compile(_DEFAULT_PATTERN_SRC, False)
+_DEFAULT_PATTERN_CI = _compile(_DEFAULT_PATTERN_SRC, True)
+
+
+def _match_conventional(msg: str) -> bool:
+    """Match the default pattern (case-sensitive) in one pass, without the regex engine"""
+    # '.' never matches a newline, so only the first line can take part in a match
+    line = msg.partition('\n')[0]
+    if line.startswith(_VALID_PREFIXES_COLON):
+        return line not in _BARE_PREFIXES
+    # type(scope): description - the scope may itself contain '): '
+    paren = line.find('(')
+    if paren == -1 or line[:paren] not in _TYPES:
+        return False
+    close = line.find('): ', paren + 2)
+    return close != -1 and len(line) > close + 3
+
+
+# Hand-written matchers used in place of the regex for known (pattern, ignore_case) pairs
+_SPECIALIZED = {
+    (_DEFAULT_PATTERN_SRC, False): _match_conventional,
+}
+
+
+def _read_event_file() -> Optional[Dict[str, Any]]:
+    """Load the event payload from GITHUB_EVENT_PATH, or None if there is none"""
+    event_path = os.environ.get('GITHUB_EVENT_PATH')
+    if not event_path or not os.path.exists(event_path):
+        return None
+    return json.loads(Path(event_path).read_bytes())
+
+
+# Source of the event payload; tests can swap this out to skip the file round-trip
+_event_reader = _read_event_file
+
+
 class GitHubAction:
     """Helper class for GitHub Actions functionality"""
     
@@ -61,7 +114,7 @@ class CommitValidator:
     """Main class for validating commit messages"""
     
     def __init__(self):
-        self.pattern = GitHubAction.get_input('pattern', default=r'^(feat|fix|docs|style|refactor|test|chore|build|ci|perf|revert)(\(.+\))?: .+')
+        self.pattern = GitHubAction.get_input('pattern', default=_DEFAULT_PATTERN_SRC)
         self.pattern_description = GitHubAction.get_input('pattern-description', default='Conventional Commits format: type(scope): description')
         self.check_all_commits = GitHubAction.get_input('check-all-commits', default='false').lower() == 'true'
         self.case_sensitive = GitHubAction.get_input('case-sensitive', default='true').lower() == 'true'
@@ -69,28 +122,29 @@ class CommitValidator:
         self.custom_error_message = GitHubAction.get_input('custom-error-message')
         
         # Compile regex pattern
-        flags = 0 if self.case_sensitive else re.IGNORECASE
+        ignore_case = not self.case_sensitive
         try:
-            self.regex = re.compile(self.pattern, flags)
+            self.regex = _compile(self.pattern, ignore_case)
         except re.error as e:
             GitHubAction.set_failed(f"Invalid regex pattern: {e}")
+        
+        # Prefer a hand-written matcher when one exists for this pattern
+        self._matches = _SPECIALIZED.get((self.pattern, ignore_case)) or self.regex.search
     
     def get_commits(self) -> List[Dict[str, str]]:
         """Get commits from GitHub event payload"""
         event_name = os.environ.get('GITHUB_EVENT_NAME')
-        event_path = os.environ.get('GITHUB_EVENT_PATH')
-        
-        if not event_path or not os.path.exists(event_path):
-            GitHubAction.warning("No event payload found")
-            return []
         
         try:
-            with open(event_path, 'r') as f:
-                payload = json.load(f)
+            payload = _event_reader()
         except (json.JSONDecodeError, IOError) as e:
             GitHubAction.warning(f"Could not read event payload: {e}")
             return []
         
+        if payload is None:
+            GitHubAction.warning("No event payload found")
+            return []
+        
         commits = []
         
         if event_name == 'push':
@@ -108,6 +162,9 @@ class CommitValidator:
             GitHubAction.warning("GITHUB_TOKEN not available, cannot fetch PR commits")
             return []
         
+        # Only pull_request events need the API client, so defer its import
+        import requests
+        
         repo_owner = payload['repository']['owner']['login']
         repo_name = payload['repository']['name']
         pr_number = payload['number']
@@ -146,25 +203,29 @@ class CommitValidator:
         GitHubAction.info(f"📊 Checking {len(commits_to_check)} commit(s)")
         
         failed_commits = []
+        matches = self._matches
+        append = failed_commits.append
+        info = GitHubAction.info
+        error = GitHubAction.error
         
         for commit in commits_to_check:
             message = commit.get('message', '')
             commit_id = commit.get('id', 'unknown')
             
             # Get first line of commit message for validation
-            first_line = message.split('\n')[0].strip()
+            first_line = message.partition('\n')[0].strip()
             
-            GitHubAction.info(f"🔎 Checking commit {commit_id[:7]}: \"{first_line}\"")
+            info(f"🔎 Checking commit {commit_id[:7]}: \"{first_line}\"")
             
-            if not self.regex.search(first_line):
-                failed_commits.append({
+            if not matches(first_line):
+                append({
                     'id': commit_id,
                     'message': first_line,
                     'fullMessage': message
                 })
-                GitHubAction.error(f"❌ Commit {commit_id[:7]} failed validation: \"{first_line}\"")
+                error(f"❌ Commit {commit_id[:7]} failed validation: \"{first_line}\"")
             else:
-                GitHubAction.info(f"✅ Commit {commit_id[:7]} passed validation")
+                info(f"✅ Commit {commit_id[:7]} passed validation")
         
         is_valid = len(failed_commits) == 0
         return is_valid, failed_commits